@@ -37,6 +37,11 @@ class Post(models.Model):
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['-pub_date']),
+            models.Index(fields=['author', '-pub_date']),
+            models.Index(fields=['group', '-pub_date']),
+        ]
 
     def __str__(self):
         return self.text
@@ -82,6 +87,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-created',)
+        indexes = [
+            models.Index(fields=['post', '-created']),
+        ]
 
     def __str__(self):
         return self.text
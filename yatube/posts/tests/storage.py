@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.test import override_settings
+from django.utils.functional import empty
+
+
+class InMemoryStorage(Storage):
+    """Хранилище файлов в памяти процесса для тестов."""
+
+    def __init__(self):
+        self.files = {}
+
+    def _open(self, name, mode='rb'):
+        return ContentFile(self.files[name], name=name)
+
+    def _save(self, name, content):
+        content.seek(0)
+        self.files[name] = content.read()
+        return name
+
+    def delete(self, name):
+        self.files.pop(name, None)
+
+    def exists(self, name):
+        return name in self.files
+
+    def listdir(self, path):
+        prefix = path.strip('/')
+        prefix = prefix + '/' if prefix else ''
+        directories, files = set(), []
+        for name in self.files:
+            if not name.startswith(prefix):
+                continue
+            entry, _, rest = name[len(prefix):].partition('/')
+            if rest:
+                directories.add(entry)
+            else:
+                files.append(entry)
+        return sorted(directories), sorted(files)
+
+    def size(self, name):
+        return len(self.files[name])
+
+    def url(self, name):
+        return settings.MEDIA_URL + name
+
+
+@receiver(setting_changed)
+def thumbnail_storage_changed(setting, **kwargs):
+    """Сбрасывает хранилище sorl-thumbnail при смене THUMBNAIL_STORAGE."""
+    if setting == 'THUMBNAIL_STORAGE':
+        from sorl.thumbnail.default import storage
+        storage._wrapped = empty
+
+
+# Загруженные картинки и их миниатюры хранятся в памяти
+# при любом модуле настроек.
+in_memory_storage = override_settings(
+    DEFAULT_FILE_STORAGE='posts.tests.storage.InMemoryStorage',
+    THUMBNAIL_STORAGE='posts.tests.storage.InMemoryStorage',
+)
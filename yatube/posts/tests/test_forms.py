@@ -1,27 +1,21 @@
-import shutil
-import tempfile
-
 from http import HTTPStatus
 
-from django.conf import settings
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client, override_settings
+from django.test import TestCase, Client
 from django.urls import reverse
 
 from ..forms import PostForm
 from ..models import Group, Post
+from .fixtures import uploaded_gif
+from .storage import in_memory_storage
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@in_memory_storage
 class PostFormTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='popo')
         cls.group = Group.objects.create(
             title='Тестовая группа',
@@ -29,38 +23,17 @@ class PostFormTests(TestCase):
             description='Тестовое описание',
         )
         cls.form = PostForm()
-
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
-    def setUp(self):
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.user)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user)
 
     def test_post_create_save(self):
         """Валидная форма создает запись в базе данных
         на странице create и перенаправляет на страницу profile.
         """
-        small_gif = (
-            b'\x47\x49\x46\x38\x39\x61\x02\x00'
-            b'\x01\x00\x80\x00\x00\x00\x00\x00'
-            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-            b'\x0A\x00\x3B'
-        )
-        uploaded = SimpleUploadedFile(
-            name='small.gif',
-            content=small_gif,
-            content_type='image/gif'
-        )
-        post_count = Post.objects.count()
         form_data = {
             'text': 'Текст из формы',
             'group': self.group.id,
-            'image': uploaded,
+            'image': uploaded_gif(),
         }
         response = self.authorized_client.post(
             reverse('posts:post_create'),
@@ -70,8 +43,7 @@ class PostFormTests(TestCase):
         self.assertRedirects(response, reverse(
             'posts:profile', kwargs={'username': self.user.username})
         )
-        post = Post.objects.order_by('id').last()
-        self.assertEqual(Post.objects.count(), post_count + 1)
+        post = Post.objects.get()
         self.assertEqual(post.text, form_data['text'])
         self.assertEqual(post.group.id, form_data['group'])
         self.assertTrue(post.image, form_data['image'])
@@ -106,8 +78,7 @@ class PostFormTests(TestCase):
 
 class CommentFormTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='popo')
         cls.group = Group.objects.create(
             title='test-title',
@@ -119,24 +90,23 @@ class CommentFormTests(TestCase):
             text='test-text',
             group=cls.group,
         )
-
-    def setUp(self):
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.user)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user)
 
     def test_only_authorized_client_can_comment_posts(self):
         '''Комментировать посты может только авторизованный пользователь.'''
-        comment_count = self.post.comments.count()
         form_data = {
             'text': 'Тестовый комментарий',
         }
         response = self.authorized_client.post(
             reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
             data=form_data,
-            follow=True
         )
-        self.assertRedirects(response, reverse(
-            'posts:post_detail', kwargs={'post_id': self.post.id})
+        self.assertRedirects(
+            response,
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+            fetch_redirect_response=False,
         )
-        self.assertEqual(self.post.comments.count(), comment_count + 1)
-        self.assertEqual(self.post.comments.last().text, form_data['text'])
+        comments = list(self.post.comments.all())
+        self.assertEqual(len(comments), 1)
+        self.assertEqual(comments[0].text, form_data['text'])
@@ -10,8 +10,7 @@ User = get_user_model()
 
 class PostURLTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='popo')
         cls.group = Group.objects.create(
             title='Тестовая группа',
@@ -22,52 +21,30 @@ class PostURLTests(TestCase):
             author=cls.user,
             text='Тестовый пост',
         )
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user)
 
-    def setUp(self):
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.user)
-
-    def test_guest_urls(self):
-        """Страницы доступные любому пользователю."""
-        templates_url_names = {
-            '/',
-            f'/group/{self.group.slug}/',
-            f'/profile/{self.user.username}/',
-            f'/posts/{self.post.pk}/',
-        }
-        for address in templates_url_names:
-            with self.subTest(address=address):
-                response = self.client.get(address)
-                self.assertEqual(response.status_code, HTTPStatus.OK)
-
-    def test_authorized_urls(self):
-        """Страницы доступные авторизованному пользователю."""
-        templates_url_names = {
-            '/',
-            f'/group/{self.group.slug}/',
-            f'/profile/{self.user.username}/',
-            f'/posts/{self.post.pk}/',
-            '/create/',
-        }
-        for address in templates_url_names:
-            with self.subTest(address=address):
-                response = self.authorized_client.get(address)
-                self.assertEqual(response.status_code, HTTPStatus.OK)
-
-    def test_author_post_urls(self):
-        """Страницы доступные автору."""
-        templates_url_names = {
+    def test_accessible_urls(self):
+        """Страницы доступные любому пользователю и автору поста."""
+        guest_urls = (
             '/',
             f'/group/{self.group.slug}/',
             f'/profile/{self.user.username}/',
             f'/posts/{self.post.pk}/',
+        )
+        author_urls = guest_urls + (
             '/create/',
             f'/posts/{self.post.pk}/edit/',
-        }
-        for address in templates_url_names:
-            with self.subTest(address=address):
-                response = self.authorized_client.get(address)
-                self.assertEqual(response.status_code, HTTPStatus.OK)
+        )
+        clients_urls = (
+            ('guest', self.client, guest_urls),
+            ('author', self.authorized_client, author_urls),
+        )
+        for client_name, client, urls in clients_urls:
+            for address in urls:
+                with self.subTest(client=client_name, address=address):
+                    response = client.get(address)
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
 
     def test_urls_uses_correct_template(self):
         """URL-адрес использует соответствующий шаблон."""
@@ -88,18 +65,20 @@ class PostURLTests(TestCase):
         """Страница по адресу /create/ перенаправит анонимного
         пользователя на страницу логина.
         """
-        response = self.client.get('/create/', follow=True)
+        response = self.client.get('/create/')
         self.assertRedirects(
-            response, '/auth/login/?next=/create/'
+            response, '/auth/login/?next=/create/',
+            fetch_redirect_response=False,
         )
 
     def test_post_edit_url_redirect_anonymous_on_admin_login(self):
         """Страница по адресу /posts/1/edit/ перенаправит анонимного
         пользователя на страницу логина.
         """
-        response = self.client.get(f'/posts/{self.post.pk}/edit/', follow=True)
+        response = self.client.get(f'/posts/{self.post.pk}/edit/')
         self.assertRedirects(
-            response, f'/auth/login/?next=/posts/{self.post.pk}/edit/'
+            response, f'/auth/login/?next=/posts/{self.post.pk}/edit/',
+            fetch_redirect_response=False,
         )
 
     def test_server_responds_404_for_unexisted_page(self):
@@ -1,28 +1,22 @@
-import shutil
-import tempfile
-
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
-from django.conf import settings
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django import forms
 
 from yatube.settings import POSTS_COUNT
 
-from ..models import Group, Post, Follow
+from ..models import Comment, Group, Post, Follow
+from .fixtures import uploaded_gif
+from .storage import in_memory_storage
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@in_memory_storage
 class PostViewsTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='popo')
         cls.group = Group.objects.create(
             title='test-title',
@@ -34,48 +28,36 @@ class PostViewsTests(TestCase):
             slug='new-test-slug',
             description='new test-description',
         )
-        small_gif = (
-            b'\x47\x49\x46\x38\x39\x61\x02\x00'
-            b'\x01\x00\x80\x00\x00\x00\x00\x00'
-            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-            b'\x0A\x00\x3B'
-        )
-        uploaded = SimpleUploadedFile(
-            name='small.gif',
-            content=small_gif,
-            content_type='image/gif',
-        )
         cls.post = Post.objects.create(
             author=cls.user,
             text='test-text',
             group=cls.group,
-            image=uploaded,
+            image=uploaded_gif(),
         )
-
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
-    def setUp(self):
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.user)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user)
+        cls.url_index = reverse('posts:index')
+        cls.url_group = reverse(
+            'posts:group_list', kwargs={'slug': cls.group.slug})
+        cls.url_new_group = reverse(
+            'posts:group_list', kwargs={'slug': cls.new_group.slug})
+        cls.url_profile = reverse(
+            'posts:profile', kwargs={'username': cls.user.username})
+        cls.url_post_detail = reverse(
+            'posts:post_detail', kwargs={'post_id': cls.post.id})
+        cls.url_post_edit = reverse(
+            'posts:post_edit', kwargs={'post_id': cls.post.id})
+        cls.url_post_create = reverse('posts:post_create')
 
     def test_pages_uses_correct_template(self):
         """URL-адрес использует соответствующий шаблон."""
         templates_pages_names = {
-            reverse('posts:index'): 'posts/index.html',
-            reverse('posts:group_list', kwargs={'slug': self.group.slug}):
-            'posts/group_list.html',
-            reverse('posts:profile', kwargs={'username': self.user.username}):
-            'posts/profile.html',
-            reverse('posts:post_detail', kwargs={'post_id': self.post.id}):
-            'posts/post_detail.html',
-            reverse('posts:post_edit', kwargs={'post_id': self.post.id}):
-            'posts/create_post.html',
-            reverse('posts:post_create'): 'posts/create_post.html',
+            self.url_index: 'posts/index.html',
+            self.url_group: 'posts/group_list.html',
+            self.url_profile: 'posts/profile.html',
+            self.url_post_detail: 'posts/post_detail.html',
+            self.url_post_edit: 'posts/create_post.html',
+            self.url_post_create: 'posts/create_post.html',
         }
         for reverse_name, template in templates_pages_names.items():
             with self.subTest(reverse_name=reverse_name):
@@ -90,15 +72,13 @@ class PostViewsTests(TestCase):
 
     def test_index_page_show_correct_context(self):
         """Шаблон index сформирован с правильным контекстом."""
-        response = self.authorized_client.get(reverse('posts:index'))
+        response = self.authorized_client.get(self.url_index)
         index_post = response.context['page_obj'][0]
         self.context_on_page(index_post)
 
     def test_group_list_pages_show_correct_context(self):
         """Шаблон group_list сформирован с правильным контекстом."""
-        response = (self.authorized_client.get(
-            reverse('posts:group_list', kwargs={'slug': self.group.slug}))
-        )
+        response = self.authorized_client.get(self.url_group)
         response_group = response.context.get('group')
         group_post = response.context['page_obj'][0]
         self.context_on_page(group_post)
@@ -109,9 +89,7 @@ class PostViewsTests(TestCase):
 
     def test_profile_pages_show_correct_context(self):
         """Шаблон profile сформирован с правильным контекстом."""
-        response = (self.authorized_client.get(
-            reverse('posts:profile', kwargs={'username': self.user.username}))
-        )
+        response = self.authorized_client.get(self.url_profile)
         response_profile = response.context.get('post_count')
         profile_post = response.context['page_obj'][0]
         self.context_on_page(profile_post)
@@ -119,23 +97,36 @@ class PostViewsTests(TestCase):
 
     def test_post_detail_pages_show_correct_context(self):
         """Шаблон profile сформирован с правильным контекстом."""
-        response = (self.authorized_client.get(
-            reverse('posts:post_detail', kwargs={'post_id': self.post.id}))
-        )
+        response = self.authorized_client.get(self.url_post_detail)
         response_post = response.context.get('post')
         response_total_posts_user = response.context.get('total_posts_user')
         self.context_on_page(response_post)
         self.assertEqual(response_total_posts_user, 1)
         self.assertEqual(self.post, response_post)
 
+    def test_post_detail_loads_comment_authors_with_comments(self):
+        """Авторы комментариев загружаются одним запросом с комментариями."""
+        post = Post.objects.create(author=self.user, text='test-text')
+        Comment.objects.bulk_create(
+            Comment(
+                post=post,
+                author=User.objects.create_user(username=f'user{i}'),
+                text=f'test-comment{i}',
+            )
+            for i in range(3)
+        )
+        with self.assertNumQueries(2):
+            self.client.get(
+                reverse('posts:post_detail', kwargs={'post_id': post.id}))
+
     def test_post_create_and_post_edit_show_correct_context(self):
         """Шаблоны post_create и post_edit сформирован
         с правильным контекстом.
         """
-        pages_names = {
-            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
-            reverse('posts:post_create')
-        }
+        pages_names = (
+            self.url_post_edit,
+            self.url_post_create,
+        )
         for url in pages_names:
             response = self.authorized_client.get(url)
             form_fields = {
@@ -152,11 +143,11 @@ class PostViewsTests(TestCase):
         """Проверка нового поста при указании группы на страницах
          index, group_list и profile.
         """
-        pages_names = {
-            reverse('posts:index'),
-            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
-            reverse('posts:profile', kwargs={'username': self.user.username})
-        }
+        pages_names = (
+            self.url_index,
+            self.url_group,
+            self.url_profile,
+        )
         for url in pages_names:
             with self.subTest(url=url):
                 response = self.authorized_client.get(url)
@@ -167,109 +158,121 @@ class PostViewsTests(TestCase):
         """"Проверяем, что пост не попал в группу,
         для которой не был предназначен.
         """
-        new_group_url = reverse('posts:group_list',
-                                kwargs={'slug': self.new_group.slug})
-        response = self.authorized_client.get(new_group_url)
+        response = self.authorized_client.get(self.url_new_group)
         self.assertNotIn(self.post, response.context['page_obj'])
 
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    })
     def test_index_page_cache(self):
         """Проверка кеширования главной страницы."""
-        response = self.authorized_client.get(reverse('posts:index'))
+        response = self.authorized_client.get(self.url_index)
         cache_content = response.content
-        Post.objects.all().delete()
-        response = self.authorized_client.get(reverse('posts:index'))
+        Post.objects.filter(pk=self.post.pk).delete()
+        response = self.authorized_client.get(self.url_index)
         cache_content_delete = response.content
         self.assertEqual(cache_content, cache_content_delete)
         cache.clear()
-        response = self.authorized_client.get(reverse('posts:index'))
+        response = self.authorized_client.get(self.url_index)
         cache_content_clear = response.content
         self.assertNotEqual(cache_content, cache_content_clear)
 
 
 class PaginatorViewsTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='popo')
         cls.group = Group.objects.create(
             title='test-title',
             slug='test-slug',
             description='test-description',
         )
-        cls.post = [
-            Post.objects.create(
+        cls.post = Post.objects.bulk_create(
+            Post(
                 author=cls.user,
                 text='test-text' + str(i),
                 group=cls.group
             )
-            for i in range(13)]
+            for i in range(13))
+        cls.follower = User.objects.create_user(username='lopo')
+        Follow.objects.create(user=cls.follower, author=cls.user)
+        cls.follower_client = Client()
+        cls.follower_client.force_login(cls.follower)
+        cls.url_index = reverse('posts:index')
+        cls.url_group = reverse(
+            'posts:group_list', kwargs={'slug': cls.group.slug})
+        cls.url_profile = reverse(
+            'posts:profile', kwargs={'username': cls.user.username})
+        cls.url_follow_index = reverse('posts:follow_index')
 
     def test_index_first_page_contains_ten_records(self):
-        response = self.client.get(reverse('posts:index'))
+        response = self.client.get(self.url_index)
         self.assertEqual(len(response.context['page_obj']), POSTS_COUNT)
 
     def test_index_second_page_contains_three_records(self):
-        response = self.client.get(reverse('posts:index') + '?page=2')
+        response = self.client.get(self.url_index + '?page=2')
         second_page = Post.objects.count() % POSTS_COUNT
         self.assertEqual(len(response.context['page_obj']), second_page)
 
     def test_group_list_first_page_contains_ten_records(self):
-        response = self.client.get(reverse(
-            'posts:group_list', kwargs={'slug': self.group.slug})
-        )
+        response = self.client.get(self.url_group)
         self.assertEqual(len(response.context['page_obj']), POSTS_COUNT)
 
     def test_group_list_second_page_contains_three_records(self):
-        response = self.client.get(reverse(
-            'posts:group_list', kwargs={'slug': self.group.slug})
-            + '?page=2'
-        )
+        response = self.client.get(self.url_group + '?page=2')
         second_page = Post.objects.count() % POSTS_COUNT
         self.assertEqual(len(response.context['page_obj']), second_page)
 
     def test_profile_first_page_contains_ten_records(self):
-        response = self.client.get(reverse(
-            'posts:profile', kwargs={'username': self.user.username})
-        )
+        response = self.client.get(self.url_profile)
         self.assertEqual(len(response.context['page_obj']), POSTS_COUNT)
 
     def test_profile_second_page_contains_three_records(self):
-        response = self.client.get(reverse(
-            'posts:profile', kwargs={'username': self.user.username})
-            + '?page=2'
-        )
+        response = self.client.get(self.url_profile + '?page=2')
         second_page = Post.objects.count() % POSTS_COUNT
         self.assertEqual(len(response.context['page_obj']), second_page)
 
+    def test_pages_do_not_query_related_objects_per_post(self):
+        """Автор и группа постов загружаются вместе со страницей."""
+        pages_queries = (
+            (self.client, self.url_group, 3),
+            (self.client, self.url_profile, 3),
+            (self.follower_client, self.url_follow_index, 4),
+        )
+        for client, url, queries in pages_queries:
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    client.get(url)
+
 
 class FollowsViewsTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user_1 = User.objects.create_user(username='popo')
         cls.user_2 = User.objects.create_user(username='lopo')
         cls.post = Post.objects.create(
             author=cls.user_2,
             text='test-text'
         )
-
-    def setUp(self):
-        self.authorized_client = Client()
-        self.authorized_client.force_login(self.user_1)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_1)
+        cls.url_follow = reverse(
+            'posts:profile_follow', kwargs={'username': cls.user_2.username})
+        cls.url_unfollow = reverse(
+            'posts:profile_unfollow',
+            kwargs={'username': cls.user_2.username})
+        cls.url_follow_index = reverse('posts:follow_index')
 
     def test_authorized_user_can_follow_other_users(self):
         """Авторизованный пользователь может подписываться
         на других пользователей.
         """
-        follow_count = Follow.objects.count()
         self.assertFalse(Follow.objects.filter(
             user=self.user_1,
             author=self.user_2).exists())
-        self.authorized_client.get(reverse(
-            'posts:profile_follow',
-            kwargs={'username': self.user_2.username})
-        )
-        self.assertEqual(Follow.objects.count(), follow_count + 1)
+        self.authorized_client.get(self.url_follow)
         self.assertTrue(Follow.objects.filter(
             user=self.user_1,
             author=self.user_2).exists())
@@ -281,12 +284,7 @@ class FollowsViewsTests(TestCase):
         Follow.objects.create(
             user=self.user_1,
             author=self.user_2)
-        follow_count = Follow.objects.count()
-        self.authorized_client.get(reverse(
-            'posts:profile_unfollow',
-            kwargs={'username': self.user_2.username})
-        )
-        self.assertEqual(Follow.objects.count(), follow_count - 1)
+        self.authorized_client.get(self.url_unfollow)
         self.assertFalse(Follow.objects.filter(
             user=self.user_1,
             author=self.user_2).exists())
@@ -296,7 +294,7 @@ class FollowsViewsTests(TestCase):
         Follow.objects.create(
             user=self.user_1,
             author=self.user_2)
-        response = self.authorized_client.get(reverse('posts:follow_index'))
+        response = self.authorized_client.get(self.url_follow_index)
         follow_context = response.context['page_obj']
         self.assertIn(self.post, follow_context)
 
@@ -304,6 +302,6 @@ class FollowsViewsTests(TestCase):
         """Новая запись пользователя не появляется в ленте
         у тех, кто не подписан.
         """
-        response = self.authorized_client.get(reverse('posts:follow_index'))
+        response = self.authorized_client.get(self.url_follow_index)
         follow_context = response.context['page_obj']
         self.assertNotIn(self.post, follow_context)
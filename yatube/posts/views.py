@@ -1,5 +1,6 @@
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db.models import Count
 from django.shortcuts import render, get_object_or_404, redirect
 
 from .forms import PostForm, CommentForm
@@ -23,7 +24,7 @@ def index(request):
 
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    posts = group.posts.select_related('author')
 
     paginator = Paginator(posts, POSTS_COUNT)
     page_number = request.GET.get('page')
@@ -37,9 +38,9 @@ def group_posts(request, slug):
 
 
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    post_count = posts.count()
+    author = get_object_or_404(
+        User.objects.annotate(post_count=Count('posts')), username=username)
+    posts = author.posts.select_related('group')
 
     following = False
     if request.user.is_authenticated:
@@ -53,22 +54,24 @@ def profile(request, username):
     context = {
         'author': author,
         'page_obj': page_obj,
-        'post_count': post_count,
+        'post_count': author.post_count,
         'following': following,
     }
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    total_posts_user = post.author.posts.count()
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group').annotate(
+            total_posts_user=Count('author__posts')),
+        pk=post_id)
 
     form = CommentForm(request.POST or None)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
 
     context = {
         'post': post,
-        'total_posts_user': total_posts_user,
+        'total_posts_user': post.total_posts_user,
         'form': form,
         'comments': comments,
     }
@@ -127,7 +130,8 @@ def add_comment(request, post_id):
 
 @login_required
 def follow_index(request):
-    posts = Post.objects.filter(author__following__user=request.user)
+    posts = Post.objects.select_related('author', 'group').filter(
+        author__following__user=request.user)
 
     paginator = Paginator(posts, POSTS_COUNT)
     page_number = request.GET.get('page')